@@ -1,4 +1,6 @@
 import logging
+import re
+from functools import lru_cache
 
 from genai.utils.general import to_model_instance
 
@@ -10,14 +12,25 @@ except ImportError:
     )
 
 
-from typing import List, Optional
+from typing import Any, List, Optional
 
 from genai import Credentials, Model
 from genai.schemas import GenerateParams
 
+try:
+    # linear time matching regardless of the number of stop sequences
+    import re2 as _regex
+except ImportError:
+    _regex = re
+
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=256)
+def _compile_stop_sequences(stop_sequences: tuple[str, ...]) -> Any:
+    return _regex.compile("|".join(_regex.escape(sequence) for sequence in stop_sequences))
+
+
 class IBMGenAIAgent(Agent):
     def __init__(
         self,
@@ -36,6 +49,7 @@ class IBMGenAIAgent(Agent):
         self.credentials = credentials
         self.model = model
         self.params = params
+        self._model: Optional[Model] = None
 
     def generate_one(self, prompt, stop):
         return self._generate([prompt], stop)[0]
@@ -50,11 +64,23 @@ class IBMGenAIAgent(Agent):
 
         params = to_model_instance(self.params, GenerateParams)
         params.stop_sequences = stop or params.stop_sequences
-        model = Model(model=self.model, params=params, credentials=self.credentials)
-        for response in model.generate(prompts=prompts):
+        stop_pattern = _compile_stop_sequences(tuple(params.stop_sequences)) if params.stop_sequences else None
+
+        # reuse a single Model (and its service) across calls, only the parameters change
+        if self._model is None or self._model.model != self.model or self._model.creds is not self.credentials:
+            self._model = Model(model=self.model, params=params, credentials=self.credentials)
+        else:
+            self._model.params = params
+
+        log_output = logger.isEnabledFor(logging.INFO)
+        for response in self._model.generate(prompts=prompts):
             generated_text = response.generated_text
+            match = stop_pattern.search(generated_text) if stop_pattern else None
+            if match:
+                generated_text = generated_text[: match.start()]
 
-            logger.info("Output of GENAI call: {}".format(generated_text))
             result.append(generated_text)
+            if log_output:
+                logger.info("Output of GENAI call: {}".format(generated_text))
 
         return result
@@ -1,9 +1,15 @@
+import asyncio
 import logging
+import math
 import time
-from collections import deque
 from collections.abc import Generator
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+from functools import cached_property
+from queue import Queue
 from typing import Any, Callable, List, Literal, Optional, Union, overload
 
+import cachetools.func
 import httpx
 from tqdm.auto import tqdm
 
@@ -31,19 +37,34 @@ from genai.schemas.tunes_params import (
     CreateTuneHyperParams,
     CreateTuneParams,
     DownloadAssetsParams,
-    TunesListParams,
 )
 from genai.services import AsyncResponseGenerator, ServiceInterface
 from genai.services.connection_manager import ConnectionManager
 from genai.services.tune_manager import TuneManager
 from genai.utils.errors import to_genai_error
 from genai.utils.general import to_model_instance
-from genai.utils.generate_utils import create_chat_handler, generation_stream_handler
+from genai.utils.generate_utils import (
+    batch_stream,
+    create_chat_handler,
+    generation_stream_handler,
+    iterate_in_background,
+    length_order,
+    restore_order,
+)
+from genai.utils.http_provider import HttpProvider
+from genai.utils.json_utils import json_loads
+from genai.utils.request_utils import retry_backoff, sanitize_params
 from genai.utils.service_utils import _get_service
 
 logger = logging.getLogger(__name__)
 
 
+@cachetools.func.ttl_cache(ttl=10, maxsize=32)
+def _get_model_cards(service: ServiceInterface) -> list[ModelCard]:
+    # shared by consecutive available() and info() calls to avoid repeated requests
+    return Model.models(service=service)
+
+
 class Model:
     _accessors = set()
 
@@ -64,7 +85,24 @@ class Model:
         self.model = model
         self.params = params
         self.creds = credentials
-        self.service = ServiceInterface(service_url=credentials.api_endpoint, api_key=credentials.api_key)
+        self._params_cache: Optional[tuple[Any, GenerateParams]] = None
+
+    @cached_property
+    def service(self) -> ServiceInterface:
+        return ServiceInterface(service_url=self.creds.api_endpoint, api_key=self.creds.api_key)
+
+    def _get_generate_params(self, *, stream: bool) -> GenerateParams:
+        """Returns a copy of the model parameters as GenerateParams with the given stream flag.
+
+        Non-model parameters (dict, None) are validated only once and re-validated
+        only after they change.
+        """
+        if isinstance(self.params, GenerateParams):
+            return self.params.model_copy(update={"stream": stream})
+
+        if self._params_cache is None or self._params_cache[0] != self.params:
+            self._params_cache = (deepcopy(self.params), to_model_instance(self.params, GenerateParams))
+        return self._params_cache[1].model_copy(update={"stream": stream})
 
     @overload
     def generate_stream(
@@ -93,15 +131,21 @@ class Model:
         *,
         raw_response: Optional[bool] = False,
     ):
+        """Streams the generated tokens for the given prompts.
+
+        Args:
+            prompts (list[str]): The list of one or more prompt strings.
+            options (Options, optional): Additional parameters to pass in the query payload. Defaults to None.
+            raw_response (optional bool): Yields the whole response object instead of it's results.
+        """
         if len(prompts) > 0 and isinstance(prompts[0], PromptPattern):
             prompts = PromptPattern.list_str(prompts)
 
-        params = to_model_instance(self.params, GenerateParams)
-        params.stream = True
+        params = sanitize_params(self._get_generate_params(stream=True))
 
         try:
             for i in range(0, len(prompts), Metadata.DEFAULT_MAX_PROMPTS):
-                batch = prompts[i : min(i + Metadata.DEFAULT_MAX_PROMPTS, len(prompts))]
+                batch = prompts[i : i + Metadata.DEFAULT_MAX_PROMPTS]
                 response_gen = self.service.generate(self.model, batch, params, options=options, streaming=True)
                 for response in generation_stream_handler(
                     response_gen,
@@ -113,14 +157,68 @@ class Model:
                         continue
 
                     if response.moderation:
-                        yield GenerateStreamResult(moderation=response.moderation)
+                        yield GenerateStreamResult.model_construct(moderation=response.moderation)
 
                     for result in response.results or []:
                         yield result
-
         except Exception as ex:
             raise to_genai_error(ex)
 
+    @overload
+    def generate_stream_batched(
+        self,
+        prompts: Union[list[str], list[PromptPattern]],
+        options: Optional[Options] = None,
+        *,
+        raw_response: Optional[Literal[False]] = None,
+        max_batch_size: int = 16,
+        min_batch_size: int = 1,
+        growth_factor: float = 3.0,
+    ) -> Generator[list[GenerateStreamResult], None, None]:
+        ...
+
+    @overload
+    def generate_stream_batched(
+        self,
+        prompts: Union[list[str], list[PromptPattern]],
+        options: Optional[Options] = None,
+        *,
+        raw_response: Literal[True],
+        max_batch_size: int = 16,
+        min_batch_size: int = 1,
+        growth_factor: float = 3.0,
+    ) -> Generator[list[ApiGenerateStreamResponse], None, None]:
+        ...
+
+    def generate_stream_batched(
+        self,
+        prompts: Union[list[str], list[PromptPattern]],
+        options: Optional[Options] = None,
+        *,
+        raw_response: Optional[bool] = False,
+        max_batch_size: int = 16,
+        min_batch_size: int = 1,
+        growth_factor: float = 3.0,
+    ):
+        """Streams the generated tokens for the given prompts in lists instead of one by one.
+        A list that is not full is yielded at the latest 50 ms after its first item arrived.
+
+        Args:
+            prompts (list[str]): The list of one or more prompt strings.
+            options (Options, optional): Additional parameters to pass in the query payload. Defaults to None.
+            raw_response (optional bool): Yields the whole response objects instead of their results.
+            max_batch_size (int, optional): Maximum number of items in a list. Defaults to 16.
+            min_batch_size (int, optional): Size of the first list, keeps the time to the first token low.
+                Defaults to 1.
+            growth_factor (float, optional): Factor by which the size of every next list grows. Defaults to 3.0.
+        """
+        yield from batch_stream(
+            self.generate_stream(prompts, options, raw_response=raw_response),
+            max_batch_size=max_batch_size,
+            min_batch_size=min_batch_size,
+            growth_factor=growth_factor,
+        )
+
     def chat(
         self,
         messages: List[BaseMessage],
@@ -136,7 +234,7 @@ class Model:
             **kwargs,
         )
         response = raw_response.json()
-        return ChatResponse(**response)
+        return ChatResponse.model_validate(response)
 
     def chat_stream(
         self,
@@ -162,6 +260,8 @@ class Model:
         options: Optional[Options] = None,
         *,
         raw_response: Optional[Literal[False]] = None,
+        max_concurrency_limit: Optional[int] = None,
+        bucket_by_length: bool = False,
     ) -> Generator[GenerateResult, None, None]:
         ...
 
@@ -172,6 +272,8 @@ class Model:
         options: Optional[Options] = None,
         *,
         raw_response: Literal[True],
+        max_concurrency_limit: Optional[int] = None,
+        bucket_by_length: bool = False,
     ) -> Generator[GenerateResponse, None, None]:
         ...
 
@@ -181,71 +283,109 @@ class Model:
         options: Optional[Options] = None,
         *,
         raw_response: Optional[bool] = False,
+        max_concurrency_limit: Optional[int] = None,
+        bucket_by_length: bool = False,
     ):
         """The generate endpoint is the centerpiece of the GENAI alpha.
         It provides a simplified and flexible, yet powerful interface to the supported
         models as a service. Given a text prompt as inputs, and required parameters
         the selected model (model_id) will generate a completion text as generated_text.
+        Every prompt is sent as a separate request and a new one is admitted as soon as any
+        in-flight request completes. Results are yielded in the order of the prompts.
 
         Args:
             prompts (list[str]): The list of one or more prompt strings.
             options (Options, optional): Additional parameters to pass in the query payload. Defaults to None.
             raw_response (optional bool): Yields the whole response object instead of it's results.
+            max_concurrency_limit (int, optional): Maximum number of concurrent requests to make. Defaults to None.
+            bucket_by_length (bool, optional): Sends the prompts ordered by their length, so the concurrent requests
+                carry prompts of similar length. Results are still yielded in the order of the prompts.
+                Defaults to False.
         """
         if len(prompts) > 0 and isinstance(prompts[0], PromptPattern):
             prompts = PromptPattern.list_str(prompts)
 
-        params = to_model_instance(self.params, GenerateParams)
-        params.stream = False
+        params = sanitize_params(self._get_generate_params(stream=False))
 
         logger.debug(f"Calling Generate. Prompts: {prompts}, params: {params}")
 
-        def get_remaining_limit():
-            limits = self.service.generate_limits()
-            return limits.tokenCapacity - limits.tokensUsed
+        if len(prompts) == 0:
+            return
 
-        remaining_limit = get_remaining_limit()
+        order = length_order(prompts) if bucket_by_length else range(len(prompts))
+        limits = self.service.generate_limits()
+        remaining_limit = limits.tokenCapacity - limits.tokensUsed
+        concurrency_limit = max(min(max_concurrency_limit or math.inf, limits.tokenCapacity), 1)
 
-        def execute(inputs: list, attempt=0) -> GenerateResponse:
-            response = self.service.generate(
+        async def execute(client: httpx.AsyncClient, inputs: list, attempt=0) -> GenerateResponse:
+            nonlocal remaining_limit
+            response = await self.service.async_generate(
                 model=self.model,
                 inputs=inputs,
                 params=params,
                 options=options,
+                client=client,
             )
             if response.is_success:
-                raw_response = response.json()
-                for i, result in enumerate(raw_response["results"]):
-                    result["input_text"] = inputs[i]
-                return GenerateResponse(**raw_response)
+                # prefer the capacity reported by the server, otherwise just release the slot
+                try:
+                    remaining_limit = int(response.headers.get("x-ratelimit-remaining", ""))
+                except ValueError:
+                    remaining_limit += 1
+
+                generate_response = GenerateResponse.model_validate(json_loads(response.content))
+                for result, input_text in zip(generate_response.results, inputs):
+                    result.input_text = input_text
+                return generate_response
             elif (
                 response.status_code == httpx.codes.TOO_MANY_REQUESTS
                 and attempt < ConnectionManager.MAX_RETRIES_GENERATE
             ):
-                nonlocal remaining_limit
                 remaining_limit = 0
-                time.sleep(2 ** (attempt + 1))
-                return execute(inputs, attempt + 1)
+                await asyncio.sleep(retry_backoff(attempt))
+                return await execute(client, inputs, attempt + 1)
             else:
                 raise GenAiException(response)
 
+        async def dispatch(completed: Queue):
+            nonlocal remaining_limit
+            cursor = 0
+            in_flight: dict[asyncio.Task, int] = {}
+
+            async with HttpProvider.get_async_client(timeout=ConnectionManager.TIMEOUT_GENERATE) as client:
+                try:
+                    while cursor < len(prompts) or in_flight:
+                        # admit a new prompt as soon as a request slot gets free, when the budget is
+                        # exhausted a single request is still sent and a possible 429 is retried
+                        while (
+                            cursor < len(prompts)
+                            and (remaining_limit > 0 or not in_flight)
+                            and len(in_flight) < concurrency_limit
+                        ):
+                            remaining_limit -= 1
+                            index = order[cursor]
+                            in_flight[asyncio.create_task(execute(client, prompts[index : index + 1]))] = index
+                            cursor += 1
+
+                        done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                        for task in done:
+                            completed.put_nowait((in_flight.pop(task), task.result()))
+                finally:
+                    for task in in_flight:
+                        task.cancel()
+                    await asyncio.gather(*in_flight, return_exceptions=True)
+
+        responses = iterate_in_background(dispatch)
         try:
-            remaining_prompts = deque(prompts)
-            while remaining_prompts:
-                while remaining_limit <= 0:
-                    time.sleep(1)
-                    remaining_limit = get_remaining_limit()
-
-                prompts_to_process = min(remaining_limit, Metadata.DEFAULT_MAX_PROMPTS, len(remaining_prompts))
-                remaining_limit -= prompts_to_process
-                inputs = [remaining_prompts.popleft() for _ in range(prompts_to_process)]
-                response = execute(inputs)
+            for response in responses:
                 if raw_response:
                     yield response
                 else:
                     yield from response.results
         except Exception as ex:
             raise to_genai_error(ex)
+        finally:
+            responses.close()
 
     def generate(
         self,
@@ -274,6 +414,7 @@ class Model:
         *,
         throw_on_error: bool = False,
         max_concurrency_limit: Optional[int] = None,
+        bucket_by_length: bool = False,
     ) -> Generator[Union[GenerateResult, None], None, None]:
         """The generate endpoint is the centerpiece of the GENAI alpha.
         It provides a simplified and flexible, yet powerful interface to the supported
@@ -291,20 +432,24 @@ class Model:
             options (Options, optional): Additional parameters to pass in the query payload. Defaults to None.
             throw_on_error (bool, optional): Throws error on failure. Defaults to False.
             max_concurrency_limit (int, optional): Maximum number of concurrent requests to make. Defaults to None.
+            bucket_by_length (bool, optional): Sends the prompts ordered by their length, so the concurrent requests
+                carry prompts of similar length. With ordered=True the results are still returned in the order
+                of the prompts. Defaults to False.
         Returns:
             Generator[Union[GenerateResult, None]]: A list of results
         """
         if len(prompts) > 0 and isinstance(prompts[0], PromptPattern):
             prompts = PromptPattern.list_str(prompts)
 
-        params = to_model_instance(self.params, GenerateParams)
-        params.stream = False
+        params = sanitize_params(self._get_generate_params(stream=False))
         logger.debug(f"Calling Generate. Prompts: {prompts}, Params: {params}")
 
+        order = length_order(prompts) if bucket_by_length else None
+
         try:
             with AsyncResponseGenerator(
                 model_id=self.model,
-                prompts=prompts,
+                prompts=[prompts[i] for i in order] if order else prompts,
                 params=params,
                 service=self.service,
                 ordered=ordered,
@@ -313,13 +458,17 @@ class Model:
                 throw_on_error=throw_on_error,
                 max_concurrency_limit=max_concurrency_limit,
             ) as generator:
-                for response in tqdm(
+                responses = tqdm(
                     iterable=generator.generate_response(),
                     total=len(prompts),
                     desc="Progress",
                     unit=" inputs",
                     disable=hide_progressbar,
-                ):
+                )
+                if order and ordered:
+                    responses = restore_order(responses, order)
+
+                for response in responses:
                     yield response
         except Exception as ex:
             raise to_genai_error(ex)
@@ -347,34 +496,26 @@ class Model:
 
         params = TokenParams(return_tokens=return_tokens)
 
-        def execute(attempt=0):
-            for i in range(0, len(prompts), Metadata.DEFAULT_MAX_PROMPTS):
-                response = self.service.tokenize(
-                    model=self.model,
-                    inputs=prompts[i : min(i + Metadata.DEFAULT_MAX_PROMPTS, len(prompts))],
-                    params=params,
-                    options=options,
-                )
+        def execute(inputs: list[str], attempt=0) -> TokenizeResponse:
+            response = self.service.tokenize(model=self.model, inputs=inputs, params=params, options=options)
 
-                if response.is_success:
-                    response_json = response.json()
-                    for y, result in enumerate(response_json["results"]):
-                        result["input_text"] = prompts[i + y]
-                    responses = TokenizeResponse(**response_json)
-                    return responses
-                elif (
-                    response.status_code == httpx.codes.TOO_MANY_REQUESTS
-                    and attempt < ConnectionManager.MAX_RETRIES_TOKENIZE
-                ):
-                    time.sleep(2 ** (attempt + 1))
-                    return execute(attempt + 1)
-                else:
-                    raise GenAiException(response)
+            if response.is_success:
+                responses = TokenizeResponse.model_validate(json_loads(response.content))
+                for result, input_text in zip(responses.results, inputs):
+                    result.input_text = input_text
+                return responses
+            elif (
+                response.status_code == httpx.codes.TOO_MANY_REQUESTS
+                and attempt < ConnectionManager.MAX_RETRIES_TOKENIZE
+            ):
+                time.sleep(retry_backoff(attempt))
+                return execute(inputs, attempt + 1)
+            else:
+                raise GenAiException(response)
 
         try:
-            response = execute()
-            for token in response.results:
-                yield token
+            for i in range(0, len(prompts), Metadata.DEFAULT_MAX_PROMPTS):
+                yield from execute(prompts[i : i + Metadata.DEFAULT_MAX_PROMPTS]).results
         except Exception as ex:
             raise to_genai_error(ex)
 
@@ -496,18 +637,26 @@ class Model:
         return tune.status
 
     def delete(self):
-        params = TunesListParams()
-        tunes = TuneManager.list_tunes(service=self.service, params=params).results
-        id_to_status = {t.id: t.status for t in tunes}
-        if self.model not in id_to_status:
-            raise GenAiException(ValueError("Tuned model not found. Currently method supports only tuned models."))
+        try:
+            TuneManager.get_tune(tune_id=self.model, service=self.service)
+        except GenAiException as ex:
+            if getattr(ex.error, "status_code", None) == httpx.codes.NOT_FOUND:
+                raise GenAiException(
+                    ValueError("Tuned model not found. Currently method supports only tuned models.")
+                ) from ex
+            raise
         TuneManager.delete_tune(service=self.service, tune_id=self.model)
 
     def download(self):
         enconder_params = DownloadAssetsParams(id=self.model, content="encoder")
         logs_params = DownloadAssetsParams(id=self.model, content="logs")
-        TuneManager.download_tune_assets(service=self.service, params=enconder_params)
-        TuneManager.download_tune_assets(service=self.service, params=logs_params)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            list(
+                executor.map(
+                    lambda params: TuneManager.download_tune_assets(service=self.service, params=params),
+                    [enconder_params, logs_params],
+                )
+            )
 
     @staticmethod
     def models(credentials: Credentials = None, service: ServiceInterface = None) -> list[ModelCard]:
@@ -522,7 +671,7 @@ class Model:
         """
         service = _get_service(credentials, service)
         response = service.models()
-        cards = ModelList(**response.json()).results
+        cards = ModelList.model_validate(json_loads(response.content)).results
         return cards
 
     def available(self) -> bool:
@@ -532,8 +681,7 @@ class Model:
         Returns:
             bool: Boolean indicating model availability
         """
-        idset = set(m.id for m in Model.models(service=self.service))
-        return self.model in idset
+        return any(m.id == self.model for m in _get_model_cards(self.service))
 
     def info(self) -> Union[ModelCard, None]:
         """Get info of the model
@@ -541,5 +689,4 @@ class Model:
         Returns:
             Union[ModelCard, TuneInfoResult, None]: Model info
         """
-        id_to_model = {m.id: m for m in Model.models(service=self.service)}
-        return id_to_model.get(self.model, None)
+        return next((m for m in _get_model_cards(self.service) if m.id == self.model), None)
@@ -9,14 +9,14 @@ from genai.schemas import Descriptions as tx
 
 
 class LengthPenalty(BaseModel):
-    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid", protected_namespaces=())
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid", protected_namespaces=(), frozen=True)
 
     decay_factor: Optional[float] = Field(None, description=tx.DECAY_FACTOR, gt=1.00)
     start_index: Optional[int] = Field(None, description=tx.START_INDEX)
 
 
 class ReturnOptions(BaseModel):
-    model_config = ConfigDict(str_strip_whitespace=False, extra="forbid", protected_namespaces=())
+    model_config = ConfigDict(str_strip_whitespace=False, extra="forbid", protected_namespaces=(), frozen=True)
 
     input_text: Optional[bool] = Field(None, description=tx.INPUT_TEXT)
     generated_tokens: Optional[bool] = Field(None, description=tx.GENERATED_TOKEN)
@@ -42,6 +42,8 @@ class Return(ReturnOptions):
 
 
 class ModerationTypeOptions(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     input: bool = Field(description=tx.MODERATION_TYPE_INPUT, default=True)
     output: bool = Field(description=tx.MODERATION_TYPE_OUTPUT, default=True)
     threshold: float = Field(description=tx.MODERATION_TYPE_THRESHOLD, ge=0, le=1, multiple_of=0.01, default=0.75)
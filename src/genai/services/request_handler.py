@@ -2,7 +2,7 @@ import json
 import logging
 from typing import Optional
 
-from httpx import Response
+from httpx import AsyncClient, Response
 from httpx_sse import SSEError, connect_sse
 
 from genai._version import version
@@ -145,6 +145,8 @@ class RequestHandler:
         inputs: list = None,
         parameters: dict = None,
         options: Options = None,
+        *,
+        client: Optional[AsyncClient] = None,
     ):
         """Low level API for async /generate request to REST API.
 
@@ -155,6 +157,7 @@ class RequestHandler:
             inputs (list, optional): List of inputs to be queried. Defaults to None.
             parameters (dict, optional): Key-value pairs for model parameters. Defaults to None.
             options (Options, optional): Additional parameters to pass in the query payload. Defaults to None.
+            client (AsyncClient, optional): Client used for the request. Defaults to the shared generate client.
 
         Returns:
             httpx.Response: Response from the REST API.
@@ -167,7 +170,8 @@ class RequestHandler:
             parameters=parameters,
             options=options,
         )
-        return await ConnectionManager.async_generate_client.post(endpoint, headers=headers, json=json_data)
+        client = client or ConnectionManager.async_generate_client
+        return await client.post(endpoint, headers=headers, json=json_data)
 
     @staticmethod
     async def async_tokenize(
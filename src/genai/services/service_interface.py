@@ -1,7 +1,7 @@
-from typing import List, Optional
+from typing import List, Optional, Union
 
 import cachetools.func
-from httpx import ConnectError, Response
+from httpx import AsyncClient, ConnectError, Response
 
 from genai.exceptions import GenAiException
 from genai.options import Options
@@ -95,7 +95,7 @@ class ServiceInterface:
         self,
         model: str,
         inputs: list,
-        params: Optional[GenerateParams] = None,
+        params: Optional[Union[GenerateParams, dict]] = None,
         streaming: bool = False,
         options: Optional[Options] = None,
     ):
@@ -104,7 +104,8 @@ class ServiceInterface:
         Args:
             model (str): Model id.
             inputs (list): List of inputs.
-            params (GenerateParams, optional): Parameters for generation. Defaults to None.
+            params (Union[GenerateParams, dict], optional): Parameters for generation, a dict is sent as is.
+                Defaults to None.
             streaming (bool, optional): Streaming response flag. Defaults to False.
             options (Options, optional): Additional parameters to pass in the query payload. Defaults to None.
 
@@ -198,14 +199,24 @@ class ServiceInterface:
     # * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * *
     #   ASYNC
     # * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * *
-    async def async_generate(self, model, inputs, params: GenerateParams = None, options: Options = None):
+    async def async_generate(
+        self,
+        model,
+        inputs,
+        params: Optional[Union[GenerateParams, dict]] = None,
+        options: Options = None,
+        *,
+        client: Optional[AsyncClient] = None,
+    ):
         """Generate a completion text for the given model, inputs, and params.
 
         Args:
             model (str): Model id.
             inputs (list): List of inputs.
-            params (GenerateParams, optional): Parameters for generation. Defaults to None.
+            params (Union[GenerateParams, dict], optional): Parameters for generation, a dict is sent as is.
+                Defaults to None.
             options (Options, optional): Additional parameters to pass in the query payload. Defaults to None.
+            client (AsyncClient, optional): Client used for the request. Defaults to the shared generate client.
 
         Returns:
             Any: json from querying for text completion.
@@ -220,6 +231,7 @@ class ServiceInterface:
                 inputs=inputs,
                 parameters=params,
                 options=options,
+                client=client,
             )
         except Exception as e:
             # without VPN this will fail
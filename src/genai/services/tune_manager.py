@@ -195,8 +195,7 @@ class TuneManager:
         if output_path == "tune_assets":
             parent_path = pathlib.Path(__file__).parent.resolve()
             output_path = os.path.join(parent_path, output_path)
-        if not (os.path.exists(output_path) and os.path.isdir(output_path)):
-            os.makedirs(output_path)
+        os.makedirs(output_path, exist_ok=True)
         return os.path.join(output_path, filename)
 
     @staticmethod
@@ -1,7 +1,21 @@
-import json
+import asyncio
 import logging
+import threading
 import time
-from typing import Any, Generator, List, Optional, Type, TypeVar, Union
+from concurrent.futures import ThreadPoolExecutor
+from queue import Empty, Queue
+from typing import (
+    Any,
+    Callable,
+    Coroutine,
+    Generator,
+    Iterable,
+    List,
+    Optional,
+    Type,
+    TypeVar,
+    Union,
+)
 
 import httpx
 from pydantic import BaseModel
@@ -15,6 +29,8 @@ from genai.services import ServiceInterface
 from genai.services.connection_manager import ConnectionManager
 from genai.utils.errors import to_genai_error
 from genai.utils.general import to_model_instance
+from genai.utils.json_utils import json_loads
+from genai.utils.request_utils import retry_backoff
 
 Params = Union[GenerateParams, TokenParams, Any]
 
@@ -30,13 +46,142 @@ def generation_stream_handler(
             continue
 
         try:
-            parsed_response: dict = json.loads(response)
-            yield ResponseModel(**parsed_response)
+            parsed_response: dict = json_loads(response)
+            yield ResponseModel.model_validate(parsed_response)
         except Exception as err:
             logger.error("Could not parse {} as json".format(response))
             raise to_genai_error(err)
 
 
+def length_order(prompts: list[str]) -> list[int]:
+    """Returns the indices of the prompts sorted by the prompt length.
+
+    Sending prompts of similar length together reduces the padding the server has to add when it batches them.
+    """
+    return sorted(range(len(prompts)), key=lambda i: len(prompts[i]))
+
+
+def restore_order(items: Iterable[Any], order: list[int]) -> Generator[Any, None, None]:
+    """Yields items that arrive in the given order of indices in ascending index order."""
+    pending: dict[int, Any] = {}
+    next_index = 0
+    for index, item in zip(order, items):
+        pending[index] = item
+        while next_index in pending:
+            yield pending.pop(next_index)
+            next_index += 1
+
+
+def batch_stream(
+    items: Iterable[Any],
+    *,
+    max_batch_size: int,
+    min_batch_size: int = 1,
+    growth_factor: float = 3.0,
+    flush_interval: float = 0.05,
+) -> Generator[list[Any], None, None]:
+    """Groups streamed items into lists.
+
+    The first list holds min_batch_size items and every next one grows by growth_factor
+    up to max_batch_size. The items are read in a background thread and a list that is not full
+    is yielded flush_interval seconds after its first item arrived, even if the stream stalls.
+    """
+    received: Queue = Queue()
+    stopped = threading.Event()
+
+    def read():
+        try:
+            for item in items:
+                if stopped.is_set():
+                    break
+                received.put((False, item))
+            else:
+                received.put((True, None))
+        except Exception as ex:
+            received.put((True, ex))
+        finally:
+            close = getattr(items, "close", None)
+            if close is not None:
+                close()
+
+    threading.Thread(target=read, daemon=True).start()
+
+    batch_size = max(min(min_batch_size, max_batch_size), 1)
+    pending: list[Any] = []
+    deadline: Optional[float] = None
+    try:
+        while True:
+            try:
+                timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+                finished, value = received.get(timeout=timeout)
+            except Empty:
+                finished, value = False, None
+            else:
+                if finished:
+                    break
+                pending.append(value)
+                if deadline is None:
+                    deadline = time.monotonic() + flush_interval
+                if len(pending) < batch_size:
+                    continue
+
+            yield pending
+            pending = []
+            deadline = None
+            batch_size = min(max(int(batch_size * growth_factor), batch_size), max_batch_size)
+
+        if pending:
+            yield pending
+        if value is not None:
+            raise value
+    finally:
+        stopped.set()
+
+
+def iterate_in_background(dispatch: Callable[[Queue], Coroutine[Any, Any, None]]) -> Generator[Any, None, None]:
+    """Runs the dispatch coroutine on an event loop in a background thread and yields
+    the results it reports in the order of their indices.
+
+    The coroutine receives a queue into which it puts (index, result) tuples, the indices are
+    consecutive numbers starting from 0. An exception raised by the coroutine is re-raised here.
+    Closing the generator cancels the coroutine.
+    """
+    completed: Queue = Queue()
+
+    async def run():
+        try:
+            await dispatch(completed)
+        except Exception as ex:
+            completed.put_nowait((None, ex))
+        else:
+            completed.put_nowait((None, None))
+
+    loop = asyncio.new_event_loop()
+    dispatch_task = loop.create_task(run())
+    try:
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(loop.run_until_complete, dispatch_task)
+            try:
+                # results may arrive out of order, buffer them until the preceding ones are yielded
+                buffer: dict[int, Any] = {}
+                next_index = 0
+                while True:
+                    index, result = completed.get()
+                    if index is None:
+                        if result is not None:
+                            raise result
+                        break
+
+                    buffer[index] = result
+                    while next_index in buffer:
+                        yield buffer.pop(next_index)
+                        next_index += 1
+            finally:
+                loop.call_soon_threadsafe(dispatch_task.cancel)
+    finally:
+        loop.close()
+
+
 def create_chat_handler(service: ServiceInterface, *, model_id: str, params: Optional[Params] = None):
     def chat_handler(
         messages: List[BaseMessage],
@@ -68,7 +213,7 @@ def create_chat_handler(service: ServiceInterface, *, model_id: str, params: Opt
             if streaming or response.is_success:
                 return response
             elif response.status_code == httpx.codes.TOO_MANY_REQUESTS and attempt < ConnectionManager.MAX_RETRIES_CHAT:
-                time.sleep(2 ** (attempt + 1))
+                time.sleep(retry_backoff(attempt))
                 return execute(attempt + 1)
             else:
                 raise GenAiException(response)
@@ -1,4 +1,25 @@
 import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_loads(content: Union[bytes, str]) -> Any:
+    """
+    Parses a JSON document, using orjson when it is installed
+
+    Args:
+        content (bytes | str) : The JSON document, for example the content of an HTTP response
+
+    Returns:
+        Any : The parsed document
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
 
 
 def json_load(file):
@@ -1,3 +1,5 @@
+import random
+
 from pydantic import BaseModel
 
 
@@ -5,3 +7,8 @@ def sanitize_params(params):
     if isinstance(params, BaseModel):
         return params.model_dump(by_alias=True, exclude_none=True)
     return params
+
+
+def retry_backoff(attempt: int) -> float:
+    """Returns the delay in seconds before the next retry, exponential with random jitter."""
+    return random.uniform(0.5, 1.5) * 2 ** (attempt + 1)
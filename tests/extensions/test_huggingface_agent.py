@@ -1,6 +1,7 @@
 import pytest
 from pytest_httpx import HTTPXMock
 
+from genai import Credentials
 from genai.extensions.huggingface import IBMGenAIAgent
 from genai.schemas import GenerateParams
 from genai.services import ServiceInterface
@@ -36,3 +37,26 @@ class TestHuggingfaceAgent:
         httpx_mock.add_response(url=match_endpoint(ServiceInterface.GENERATE), method="POST", json=GENERATE_RESPONSE)
         agent = IBMGenAIAgent(credentials=credentials, model="google/flan-ul2", params=params)
         agent.run("Summarize the text", text="Testing the summarization")
+
+    def test_agent_truncates_stop_sequences(self, credentials, params, httpx_mock: HTTPXMock):
+        GENERATE_RESPONSE = SimpleResponse.generate(
+            model="google/flan-ul2",
+            inputs=["print(result)\n\nTask: next"],
+            params=params,
+        )
+        httpx_mock.add_response(url=match_endpoint(ServiceInterface.GENERATE), method="POST", json=GENERATE_RESPONSE)
+        agent = IBMGenAIAgent(credentials=credentials, model="google/flan-ul2", params=params)
+
+        assert agent.generate_one("prompt", stop=["Task:", "Human:"]) == "print(result)\n\n"
+
+    def test_agent_picks_up_new_credentials(self, credentials, params, httpx_mock: HTTPXMock):
+        GENERATE_RESPONSE = SimpleResponse.generate(model="google/flan-ul2", inputs=["output"], params=params)
+        httpx_mock.add_response(url=match_endpoint(ServiceInterface.GENERATE), method="POST", json=GENERATE_RESPONSE)
+        agent = IBMGenAIAgent(credentials=credentials, model="google/flan-ul2", params=params)
+
+        agent.generate_one("prompt", stop=None)
+        agent.credentials = Credentials(api_key="NEW_API_KEY", api_endpoint=credentials.api_endpoint)
+        agent.generate_one("prompt", stop=None)
+
+        requests = httpx_mock.get_requests(url=match_endpoint(ServiceInterface.GENERATE))
+        assert requests[-1].headers["Authorization"] == "Bearer NEW_API_KEY"
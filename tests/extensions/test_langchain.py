@@ -12,7 +12,7 @@ from genai.schemas.api_responses import ApiGenerateStreamResponse
 from genai.schemas.responses import GenerateResponse
 from genai.services import ServiceInterface
 from tests.assets.response_helper import SimpleResponse
-from tests.utils import match_endpoint
+from tests.utils import add_echo_callback, match_endpoint
 
 
 @pytest.mark.extension
@@ -49,7 +49,7 @@ class TestLangChain:
         GENERATE_RESPONSE = SimpleResponse.generate(model="google/flan-ul2", inputs=multi_prompts, params=params)
         expected_response = GenerateResponse(**GENERATE_RESPONSE)
 
-        httpx_mock.add_response(url=match_endpoint(ServiceInterface.GENERATE), method="POST", json=GENERATE_RESPONSE)
+        add_echo_callback(httpx_mock, ServiceInterface.GENERATE, SimpleResponse.generate)
 
         model = LangChainInterface(model="google/flan-ul2", params=params, credentials=credentials)
         observed = await model.agenerate(prompts=multi_prompts)
@@ -2,6 +2,7 @@ import pytest
 from pydantic import ValidationError
 
 from genai.schemas import GenerateParams, LengthPenalty, Return, ReturnOptions
+from genai.schemas.generate_params import HAPOptions
 
 # API Reference : https://workbench.res.ibm.com/docs/api-reference#generate
 
@@ -301,6 +302,13 @@ class TestGenerateSchema:
         with pytest.deprecated_call():
             GenerateParams(returns=Return())
 
+    def test_options_are_frozen(self):
+        options = [LengthPenalty(decay_factor=1.5), ReturnOptions(input_text=True), HAPOptions(threshold=0.5)]
+        for option in options:
+            with pytest.raises(ValidationError):
+                setattr(option, next(iter(option.model_fields_set)), None)
+            assert hash(option) == hash(option.model_copy())
+
     def test_optional_fields(self):
         try:
             genparams = GenerateParams(answer=42)
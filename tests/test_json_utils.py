@@ -1,6 +1,9 @@
+from unittest.mock import patch
+
 import pytest
 
-from genai.utils.json_utils import json_extract, json_get_all_keys
+from genai.utils import json_utils
+from genai.utils.json_utils import json_extract, json_get_all_keys, json_loads
 
 
 @pytest.mark.unit
@@ -29,3 +32,16 @@ class TestJsonUtils:
         keys = json_get_all_keys(json_obj, join=True)
         assert isinstance(keys, str)
         assert keys == "key1key21key31key31"
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_json_loads(self, json_obj, use_orjson):
+        content = b'{"key1": "val1", "key2": {"key21": "val21"}, "key3": [{"key31": "val31"}, {"key31": "val32"}]}'
+
+        if use_orjson:
+            pytest.importorskip("orjson")
+            assert json_loads(content) == json_obj
+            assert json_loads(content.decode()) == json_obj
+        else:
+            with patch.object(json_utils, "orjson", None):
+                assert json_loads(content) == json_obj
+                assert json_loads(content.decode()) == json_obj
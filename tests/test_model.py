@@ -1,5 +1,8 @@
+import json
+from unittest.mock import patch
+
 import pytest
-from pytest_httpx import HTTPXMock
+from pytest_httpx import HTTPXMock, IteratorStream
 
 from genai import Credentials, Model
 from genai.exceptions import GenAiException
@@ -7,14 +10,16 @@ from genai.routers import TunesRouter
 from genai.schemas import GenerateParams
 from genai.schemas.responses import (
     GenerateResponse,
+    GenerateStreamResult,
     ModelCard,
     ModelList,
     TokenizeResponse,
 )
 from genai.schemas.tunes_params import CreateTuneHyperParams
 from genai.services import ServiceInterface
+from genai.services.tune_manager import TuneManager
 from tests.assets.response_helper import SimpleResponse
-from tests.utils import match_endpoint
+from tests.utils import add_echo_callback, match_endpoint
 
 
 @pytest.mark.unit
@@ -47,7 +52,7 @@ class TestModel:
         GENERATE_RESPONSE = SimpleResponse.generate(model="google/flan-ul2", inputs=prompts, params=params)
         expected_generated_response = GenerateResponse(**GENERATE_RESPONSE)
 
-        httpx_mock.add_response(url=match_endpoint(ServiceInterface.GENERATE), method="POST", json=GENERATE_RESPONSE)
+        add_echo_callback(httpx_mock, ServiceInterface.GENERATE, SimpleResponse.generate)
 
         model = Model("google/flan-ul2", params=params, credentials=credentials)
 
@@ -57,6 +62,70 @@ class TestModel:
         assert responses_list == expected_generated_response.results
         for i, response in enumerate(responses_list):
             assert response.input_text == prompts[i]
+        assert len(httpx_mock.get_requests(url=match_endpoint(ServiceInterface.GENERATE))) == len(prompts)
+
+    def test_generate_concurrent_keeps_order(self, credentials, params, httpx_mock: HTTPXMock):
+        """Tests that concurrently sent requests are yielded in the order of the prompts"""
+        prompts = [f"prompt {i}" for i in range(23)]
+
+        add_echo_callback(httpx_mock, ServiceInterface.GENERATE, SimpleResponse.generate)
+
+        model = Model("google/flan-ul2", params=params, credentials=credentials)
+        responses = model.generate(prompts=prompts, max_concurrency_limit=3)
+
+        assert [response.input_text for response in responses] == prompts
+        assert [response.generated_text for response in responses] == prompts
+        for request in httpx_mock.get_requests(url=match_endpoint(ServiceInterface.GENERATE)):
+            assert json.loads(request.content)["parameters"] == params.model_dump(exclude_none=True)
+
+    def test_generate_bucket_by_length(self, credentials, params, httpx_mock: HTTPXMock):
+        prompts = ["a" * length for length in [5, 1, 4, 2, 3]]
+
+        add_echo_callback(httpx_mock, ServiceInterface.GENERATE, SimpleResponse.generate)
+
+        model = Model("google/flan-ul2", params=params, credentials=credentials)
+        responses = model.generate(prompts=prompts, max_concurrency_limit=1, bucket_by_length=True)
+
+        assert [response.input_text for response in responses] == prompts
+        requests = httpx_mock.get_requests(url=match_endpoint(ServiceInterface.GENERATE))
+        assert [json.loads(request.content)["inputs"][0] for request in requests] == sorted(prompts, key=len)
+
+    @pytest.mark.parametrize("patch_generate_limits", [{"tokens_capacity": 2, "tokens_used": 2}], indirect=True)
+    @pytest.mark.parametrize("ratelimit_remaining", ["2", "2.0", ""])
+    def test_generate_with_exhausted_limits(
+        self, credentials, params, patch_generate_limits, ratelimit_remaining, httpx_mock: HTTPXMock
+    ):
+        """Tests that the budget is taken from the response headers instead of polling the limits endpoint"""
+        prompts = [f"prompt {i}" for i in range(6)]
+
+        add_echo_callback(
+            httpx_mock,
+            ServiceInterface.GENERATE,
+            SimpleResponse.generate,
+            headers={"x-ratelimit-remaining": ratelimit_remaining},
+        )
+
+        model = Model("google/flan-ul2", params=params, credentials=credentials)
+        responses = model.generate(prompts=prompts)
+
+        assert [response.input_text for response in responses] == prompts
+        assert len(httpx_mock.get_requests(url=match_endpoint(ServiceInterface.GENERATE_LIMITS))) == 1
+
+    def test_generate_retries_too_many_requests(self, credentials, params, httpx_mock: HTTPXMock):
+        prompts = ["a"]
+        httpx_mock.add_response(url=match_endpoint(ServiceInterface.GENERATE), method="POST", status_code=429)
+        httpx_mock.add_response(
+            url=match_endpoint(ServiceInterface.GENERATE),
+            method="POST",
+            json=SimpleResponse.generate(model="google/flan-ul2", inputs=prompts),
+        )
+
+        model = Model("google/flan-ul2", params=params, credentials=credentials)
+        with patch("genai.model.retry_backoff", return_value=0) as backoff:
+            responses = model.generate(prompts=prompts)
+
+        backoff.assert_called_once_with(0)
+        assert [response.input_text for response in responses] == prompts
 
     def test_generate_throws_exception_for_non_200(self, credentials, params, prompts, httpx_mock: HTTPXMock):
         """Tests that the GenAiException is thrown if the status code is not 200"""
@@ -76,6 +145,44 @@ class TestModel:
         with pytest.raises(GenAiException):
             model.generate(prompts=prompts)
 
+    def test_generate_stream(self, credentials, params, httpx_mock: HTTPXMock):
+        GENERATE_STREAM_RESPONSES = SimpleResponse.generate_stream(model=self.model, inputs=self.inputs, params=params)
+        moderation = {"hap": [{"flagged": True, "score": 0.9, "success": True, "position": {"start": 0, "end": 4}}]}
+        GENERATE_STREAM_RESPONSES[0]["moderation"] = moderation
+        httpx_mock.add_response(
+            url=match_endpoint(ServiceInterface.GENERATE),
+            method="POST",
+            stream=IteratorStream(
+                [f"data: {json.dumps(response)}\n\n".encode() for response in GENERATE_STREAM_RESPONSES]
+            ),
+            headers={"Content-Type": "text/event-stream"},
+        )
+
+        model = Model(self.model, params=params, credentials=credentials)
+        results = list(model.generate_stream(prompts=self.inputs))
+
+        assert results[0] == GenerateStreamResult(moderation=moderation)
+        assert results[1:] == [GenerateStreamResult(**response["results"][0]) for response in GENERATE_STREAM_RESPONSES]
+
+    def test_generate_stream_batched(self, credentials, params, httpx_mock: HTTPXMock):
+        GENERATE_STREAM_RESPONSES = SimpleResponse.generate_stream(model=self.model, inputs=self.inputs, params=params)
+        httpx_mock.add_response(
+            url=match_endpoint(ServiceInterface.GENERATE),
+            method="POST",
+            stream=IteratorStream(
+                [f"data: {json.dumps(response)}\n\n".encode() for response in GENERATE_STREAM_RESPONSES]
+            ),
+            headers={"Content-Type": "text/event-stream"},
+        )
+
+        model = Model(self.model, params=params, credentials=credentials)
+        batches = list(model.generate_stream_batched(prompts=self.inputs, max_batch_size=4))
+
+        assert all(1 <= len(batch) <= 4 for batch in batches)
+        assert [result for batch in batches for result in batch] == [
+            GenerateStreamResult(**response["results"][0]) for response in GENERATE_STREAM_RESPONSES
+        ]
+
     def test_tokenize(self, credentials, params, httpx_mock: HTTPXMock):
         """Tests that we can call the tokenize endpoint"""
 
@@ -90,6 +197,17 @@ class TestModel:
 
         assert responses == expected_token_response.results
 
+    def test_tokenize_multiple_batches(self, credentials, params, httpx_mock: HTTPXMock):
+        prompts = [f"prompt {i}" for i in range(7)]
+
+        add_echo_callback(httpx_mock, ServiceInterface.TOKENIZE, SimpleResponse.tokenize)
+
+        model = Model("google/flan-ul2", params=params, credentials=credentials)
+        responses = model.tokenize(prompts)
+
+        assert [response.input_text for response in responses] == prompts
+        assert len(httpx_mock.get_requests(url=match_endpoint(ServiceInterface.TOKENIZE))) == 2
+
     def test_create_tune(self, credentials, httpx_mock: HTTPXMock):
         label = "test_label"
         model_id = self.model
@@ -122,6 +240,42 @@ class TestModel:
 
         assert tuned_model.status() == expected_response["results"]["status"]
 
+    def test_delete(self, credentials, httpx_mock: HTTPXMock):
+        tuned_model = Model("tune_id", params=None, credentials=credentials)
+
+        httpx_mock.add_response(
+            url=match_endpoint(TunesRouter.TUNES, tuned_model.model), method="GET", json=SimpleResponse.get_tune()
+        )
+        httpx_mock.add_response(url=match_endpoint(TunesRouter.TUNES, tuned_model.model), method="DELETE", json={})
+
+        tuned_model.delete()
+        assert len(httpx_mock.get_requests(url=match_endpoint(TunesRouter.TUNES), method="GET")) == 0
+        assert (
+            len(httpx_mock.get_requests(url=match_endpoint(TunesRouter.TUNES, tuned_model.model), method="DELETE")) == 1
+        )
+
+    def test_delete_not_found(self, credentials, httpx_mock: HTTPXMock):
+        model = Model(self.model, params=None, credentials=credentials)
+
+        httpx_mock.add_response(
+            url=match_endpoint(TunesRouter.TUNES, model.model),
+            method="GET",
+            status_code=404,
+            json={"status_code": 404, "error": "Not Found", "message": "Tune not found"},
+        )
+
+        with pytest.raises(GenAiException, match="Tuned model not found"):
+            model.delete()
+
+    def test_download(self, credentials):
+        tuned_model = Model("tune_id", params=None, credentials=credentials)
+
+        with patch.object(TuneManager, "download_tune_assets") as download_tune_assets:
+            tuned_model.download()
+
+        downloaded = {call.kwargs["params"].content for call in download_tune_assets.call_args_list}
+        assert downloaded == {"encoder", "logs"}
+
     def test_info(self, credentials, httpx_mock: HTTPXMock):
         model_id = "google/flan-t5-xl"
         response = SimpleResponse.models()
@@ -133,6 +287,14 @@ class TestModel:
         model = Model(model_id, params=None, credentials=credentials)
         assert info == model.info()
 
+    def test_available_and_info_share_models_request(self, credentials, httpx_mock: HTTPXMock):
+        httpx_mock.add_response(url=match_endpoint(ServiceInterface.MODELS), method="GET", json=SimpleResponse.models())
+
+        model = Model("google/flan-t5-xl", params=None, credentials=credentials)
+        assert model.available() is True
+        assert model.info().id == "google/flan-t5-xl"
+        assert len(httpx_mock.get_requests(url=match_endpoint(ServiceInterface.MODELS))) == 1
+
     def test_models(self, httpx_mock: HTTPXMock):
         response = SimpleResponse.models()
 
@@ -153,6 +315,18 @@ class TestModel:
         model = Model(model_id, params=None, credentials=credentials)
         assert model.available() is False
 
+    def test_generate_params_from_dict_are_revalidated_after_change(self, credentials):
+        params = {"max_new_tokens": 10}
+        model = Model("google/flan-ul2", params=params, credentials=credentials)
+
+        first = model._get_generate_params(stream=False)
+        assert first == GenerateParams(max_new_tokens=10, stream=False)
+        assert model._get_generate_params(stream=True) == GenerateParams(max_new_tokens=10, stream=True)
+
+        params["max_new_tokens"] = 20
+        assert model._get_generate_params(stream=False) == GenerateParams(max_new_tokens=20, stream=False)
+        assert first.max_new_tokens == 10
+
     @pytest.mark.parametrize("generate_params", [([],), (1,), ("",), (CreateTuneHyperParams())])
     def test_invalid_generate_parameters(self, generate_params, credentials):
         with pytest.raises(ValueError):
@@ -1,3 +1,4 @@
+import json
 import re
 import signal
 from contextlib import nullcontext as does_not_raise
@@ -12,7 +13,7 @@ from genai.schemas import GenerateParams, TokenParams
 from genai.schemas.responses import GenerateResponse, GenerateResult, TokenizeResponse
 from genai.services import ServiceInterface
 from tests.assets.response_helper import SimpleResponse
-from tests.utils import match_endpoint
+from tests.utils import add_echo_callback, match_endpoint
 
 
 @pytest.mark.unit
@@ -99,6 +100,28 @@ class TestModelAsync:
                 assert len(httpx_mock.get_requests(url=generate_request_url)) == count
                 assert response is not None
 
+    @pytest.mark.asyncio
+    async def test_generate_async_bucket_by_length(self, generate_params, httpx_mock: HTTPXMock):
+        prompts = ["a" * length for length in [5, 1, 4, 2, 3]]
+
+        add_echo_callback(httpx_mock, ServiceInterface.GENERATE, SimpleResponse.generate, model=self.model)
+
+        model = Model("google/flan-ul2", params=generate_params, credentials=self.creds)
+        responses = list(
+            model.generate_async(
+                prompts,
+                ordered=True,
+                hide_progressbar=True,
+                throw_on_error=True,
+                max_concurrency_limit=1,
+                bucket_by_length=True,
+            )
+        )
+
+        assert [response.input_text for response in responses] == prompts
+        requests = httpx_mock.get_requests(url=match_endpoint(ServiceInterface.GENERATE))
+        assert [json.loads(request.content)["inputs"][0] for request in requests] == sorted(prompts, key=len)
+
     @pytest.mark.asyncio
     async def test_tokenize_async(self, tokenize_params, httpx_mock: HTTPXMock):
         num_prompts = 31
@@ -1,9 +1,12 @@
+import time
 from re import Match
 
 import pytest
 from pydantic import BaseModel, ValidationError
 
 from genai.utils.general import to_model_instance
+from genai.utils.generate_utils import batch_stream, length_order, restore_order
+from genai.utils.request_utils import retry_backoff
 from tests.utils import match_endpoint
 
 
@@ -32,3 +35,52 @@ class TestUtils:
         match_ep = match_endpoint("v1/generate", "path", query_params={"parameter": 20, "test": "test"})
         url = "http://service_url/v1/generate/path?parameter=20&test=test"
         assert isinstance(match_ep.match(url), Match) is True
+
+    def test_batch_stream(self):
+        batches = list(
+            batch_stream(range(20), max_batch_size=8, min_batch_size=1, growth_factor=3.0, flush_interval=60)
+        )
+        assert [len(batch) for batch in batches] == [1, 3, 8, 8]
+        assert [item for batch in batches for item in batch] == list(range(20))
+
+    def test_batch_stream_flushes_stalled_stream(self):
+        def items():
+            yield from ["t0", "t1"]
+            time.sleep(0.01)
+            yield "t2"
+            time.sleep(1)
+            yield "t3"
+
+        start = time.monotonic()
+        batches = []
+        for batch in batch_stream(items(), max_batch_size=2, flush_interval=0.05):
+            batches.append((batch, time.monotonic() - start))
+
+        assert [item for batch, _ in batches for item in batch] == ["t0", "t1", "t2", "t3"]
+        assert all(len(batch) <= 2 for batch, _ in batches)
+        # the items received before the stall are flushed without waiting for "t3"
+        assert batches[-1][0] == ["t3"]
+        assert batches[-2][1] < 0.5
+
+    def test_batch_stream_raises_after_received_items(self):
+        def items():
+            yield 0
+            raise ValueError("stream failed")
+
+        batches = []
+        with pytest.raises(ValueError):
+            for batch in batch_stream(items(), max_batch_size=8, min_batch_size=2, flush_interval=60):
+                batches.append(batch)
+        assert batches == [[0]]
+
+    def test_restore_order(self):
+        prompts = ["ccc", "a", "bb", ""]
+        order = length_order(prompts)
+        assert order == [3, 1, 2, 0]
+        assert list(restore_order([prompts[i] for i in order], order)) == prompts
+
+    @pytest.mark.parametrize("attempt", [0, 1, 4])
+    def test_retry_backoff(self, attempt):
+        delays = {retry_backoff(attempt) for _ in range(20)}
+        assert all(0.5 * 2 ** (attempt + 1) <= delay <= 1.5 * 2 ** (attempt + 1) for delay in delays)
+        assert len(delays) > 1
@@ -1,8 +1,11 @@
+import json
 from re import Pattern, compile
-from typing import Union
+from typing import Callable, Optional, Union
 from urllib.parse import urlencode
 
+import httpx
 from pydantic import BaseModel
+from pytest_httpx import HTTPXMock
 
 from genai.utils.request_utils import sanitize_params
 
@@ -15,3 +18,20 @@ def match_endpoint(*paths: str, query_params: Union[dict, BaseModel, str] = "")
         query_params = "\\?" + urlencode(query_params)
 
     return compile(f".+{endpoint}{query_params}$")
+
+
+def add_echo_callback(
+    httpx_mock: HTTPXMock,
+    endpoint: str,
+    response_factory: Callable[..., dict],
+    *,
+    model: str = "google/flan-ul2",
+    headers: Optional[dict] = None,
+) -> None:
+    """Mocks the endpoint with the response built by response_factory for the inputs of each request."""
+
+    def handle_request(request: httpx.Request) -> httpx.Response:
+        inputs = json.loads(request.content)["inputs"]
+        return httpx.Response(json=response_factory(model=model, inputs=inputs), headers=headers, status_code=200)
+
+    httpx_mock.add_callback(callback=handle_request, url=match_endpoint(endpoint), method="POST")